@@ -14,7 +14,7 @@ define a custom logger and use it when training.
 from composer.loggers.file_logger import FileLogger
 from composer.loggers.in_memory_logger import InMemoryLogger
 from composer.loggers.logger import Logger, LogLevel
-from composer.loggers.logger_destination import LoggerDestination
+from composer.loggers.logger_destination import AsyncLoggerDestination, LoggerDestination
 from composer.loggers.logger_hparams import (FileLoggerHparams, InMemoryLoggerHparams, LoggerDestinationHparams,
                                              ObjectStoreLoggerHparams, ProgressBarLoggerHparams, WandBLoggerHparams)
 from composer.loggers.object_store_logger import ObjectStoreLogger
@@ -25,6 +25,7 @@ from composer.loggers.wandb_logger import WandBLogger
 __all__ = [
     "Logger",
     "LoggerDestination",
+    "AsyncLoggerDestination",
     "LogLevel",
     "FileLogger",
     "InMemoryLogger",
@@ -4,14 +4,19 @@
 
 from __future__ import annotations
 
+import copy
 import pathlib
-from abc import ABC
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
 
 from composer.core.callback import Callback
 from composer.core.state import State
-from composer.loggers.logger import LoggerDataDict, LogLevel
+from composer.core.time import Timestamp
+from composer.loggers.logger import Logger, LoggerDataDict, LogLevel
 
-__all__ = ["LoggerDestination"]
+__all__ = ["LoggerDestination", "AsyncLoggerDestination"]
 
 
 class LoggerDestination(Callback, ABC):
@@ -52,6 +57,8 @@ class LoggerDestination(Callback, ABC):
 
                 .. seealso:: :class:`~composer.loggers.file_logger.FileLogger` as an example.
 
+            :class:`AsyncLoggerDestination` implements the former pattern.
+
         Args:
             state (State): The training state.
             log_level (LogLevel): The log level.
@@ -97,3 +104,117 @@ class LoggerDestination(Callback, ABC):
         """
         del state, log_level, artifact_name, file_path, overwrite  # unused
         pass
+
+
+class AsyncLoggerDestination(LoggerDestination, ABC):
+    """Base class for logger destinations that perform I/O on a background thread.
+
+    :meth:`log_data` deepcopies the ``data`` and enqueues a ``(timestamp, log_level, data)`` tuple, so the training
+    loop is not blocked on I/O. A background thread, started on :attr:`~composer.core.event.Event.INIT`, drains the
+    queue and calls :meth:`_log_data_sync` for each entry. On :meth:`close`, any pending entries are written before
+    the thread exits.
+
+    Tensors in ``data`` (e.g. computed metrics) are copied on their device, without synchronizing with the host.
+    Converting them to Python values (e.g. with :func:`~composer.loggers.logger.format_log_data_value` or
+    :meth:`torch.Tensor.item`) should be done in :meth:`_log_data_sync`, so any device synchronization happens on the
+    background thread rather than in the training loop.
+
+    Subclasses should implement :meth:`_log_data_sync` instead of :meth:`log_data`. Subclasses that override
+    :meth:`init`, :meth:`batch_end`, :meth:`epoch_end`, or :meth:`close` must call the ``super()`` implementation.
+
+    Example
+    -------
+
+    >>> from composer.loggers import AsyncLoggerDestination
+    >>> class MyAsyncLogger(AsyncLoggerDestination):
+    ...     def _log_data_sync(self, timestamp, log_level, data):
+    ...         print(f'Batch {int(timestamp.batch)}: {log_level} {data}')
+    >>> logger = MyAsyncLogger()
+    >>> trainer = Trainer(
+    ...     ...,
+    ...     loggers=[logger]
+    ... )
+
+    Args:
+        max_queue_size (int, optional): The maximum number of entries that can be pending in the queue. If the queue
+            is full, the oldest pending entry is dropped to make room for the new one, so the training loop never
+            waits on the background thread. Set to ``0`` for an unbounded queue. (default: ``1000``)
+    """
+
+    def __init__(self, max_queue_size: int = 1000) -> None:
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must be >= 0.")
+        self._queue: queue.Queue[Tuple[Timestamp, LogLevel, LoggerDataDict]] = queue.Queue(maxsize=max_queue_size)
+        self._finished: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def _log_data_sync(self, timestamp: Timestamp, log_level: LogLevel, data: LoggerDataDict) -> None:
+        """Log data. Called from the background thread for each entry passed to :meth:`log_data`.
+
+        Args:
+            timestamp (Timestamp): The training timestamp when :meth:`log_data` was called.
+            log_level (LogLevel): The log level.
+            data (LoggerDataDict): A copy of the data to log.
+        """
+        pass
+
+    def log_data(self, state: State, log_level: LogLevel, data: LoggerDataDict):
+        entry = (state.timer.get_timestamp(), log_level, copy.deepcopy(data))
+        while True:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                # Drop the oldest entry, rather than blocking the training loop
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+            else:
+                break
+
+    def init(self, state: State, logger: Logger) -> None:
+        del state, logger  # unused
+        if self._thread is not None:
+            raise RuntimeError("The logger destination is already initialized.")
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._drain, kwargs={"is_finished": self._finished}, daemon=True)
+        self._thread.start()
+
+    def batch_end(self, state: State, logger: Logger) -> None:
+        del state, logger  # unused
+        self._check_thread()
+
+    def epoch_end(self, state: State, logger: Logger) -> None:
+        del state, logger  # unused
+        self._check_thread()
+
+    def _check_thread(self):
+        # The thread would crash if ``_log_data_sync`` raised an exception
+        if self._thread is not None and not self._thread.is_alive():
+            raise RuntimeError("Logging thread crashed. Please check the logs.")
+
+    def _drain(self, is_finished: threading.Event):
+        """Long-running target of the background thread.
+
+        Writes entries from the queue until ``is_finished`` is set and the queue is empty.
+        """
+        while True:
+            try:
+                timestamp, log_level, data = self._queue.get(block=True, timeout=0.5)
+            except queue.Empty:
+                if is_finished.is_set():
+                    break
+                else:
+                    continue
+            self._log_data_sync(timestamp, log_level, data)
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        assert self._finished is not None
+        # The thread will write all pending entries before exiting
+        self._finished.set()
+        self._thread.join()
+        self._thread = None
+        self._finished = None
@@ -1,9 +1,11 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
 """A collection of common torchmetrics for NLP tasks."""
-from typing import Mapping, Union
+from typing import Any, Callable, Mapping, Optional, Union
 
 import torch
+import torch.distributed
+import torch.nn.functional as F
 from torch import Tensor
 from torchmetrics import Metric
 
@@ -12,7 +14,37 @@ from composer.models.loss import soft_cross_entropy
 __all__ = ["Perplexity", "BinaryF1Score", "LanguageCrossEntropyLoss", "CrossEntropyLoss", "MaskedAccuracy"]
 
 
-class MaskedAccuracy(Metric):
+class _SummedStatesMetric(Metric):
+    """Base class for metrics whose states are all scalar tensors that are summed across ranks.
+
+    The default torchmetrics sync all-gathers a copy of every state from every rank. Instead, the states are packed into
+    a single tensor and summed with one all-reduce, so every rank gets the reduced states from one collective.
+    """
+
+    def _sync_dist(self, dist_sync_fn: Optional[Callable] = None, process_group: Optional[Any] = None) -> None:
+        del dist_sync_fn  # unused, as the states are always summed
+        states = [getattr(self, attr) for attr in self._reductions]
+        # float64 represents both the summed losses and the integer counts exactly
+        packed_states = torch.stack([state.to(torch.float64) for state in states])
+        torch.distributed.all_reduce(packed_states,
+                                     op=torch.distributed.ReduceOp.SUM,
+                                     group=process_group or self.process_group)
+        # Assign new tensors, rather than modifying the states in-place, as torchmetrics restores the cached local
+        # states after compute
+        for attr, state, reduced_state in zip(self._reductions, states, packed_states):
+            setattr(self, attr, reduced_state.to(state.dtype))
+
+    def _to_input_device(self, tensor: Tensor) -> None:
+        """Moves the metric states to the device of ``tensor``, if they are not already there.
+
+        The trainer normally places metrics on the model's device. When it has not, this moves the states once, on the
+        first update, rather than copying across devices on every update and syncing states that are on the host.
+        """
+        if self.device != tensor.device:
+            self.to(tensor.device)
+
+
+class MaskedAccuracy(_SummedStatesMetric):
     """Computes accuracy with support for masked indicies.
 
     Adds metric state variables:
@@ -34,16 +66,15 @@ class MaskedAccuracy(Metric):
         self.add_state("total", default=torch.tensor(0), dist_reduce_fx="sum")
 
     def update(self, preds: torch.Tensor, target: torch.Tensor):
+        self._to_input_device(target)
         # predictions is a batch x num_classes tensor, take the argmax to get class indicies
         preds = torch.argmax(preds, dim=-1)
         assert preds.shape == target.shape
 
-        # mask out the padded indicies
+        # mask out the padded indicies with a masked reduction, rather than materializing the masked elements
         mask = (target != self.ignore_index)
-        masked_target = target[mask]
-        masked_preds = preds[mask]
 
-        self.correct += torch.sum(masked_preds == masked_target)
+        self.correct += ((preds == target) & mask).sum()
         self.total += mask.sum()
 
     def compute(self):
@@ -52,7 +83,7 @@ class MaskedAccuracy(Metric):
         return self.correct.float() / self.total
 
 
-class CrossEntropyLoss(Metric):
+class CrossEntropyLoss(_SummedStatesMetric):
     """Computes cross entropy loss.
 
     Adds metric state variables:
@@ -63,15 +94,19 @@ class CrossEntropyLoss(Metric):
         vocab_size (int): The size of the tokenizer vocabulary.
         dist_sync_on_step (bool, optional): Synchronize metric state across processes at
             each forward() before returning the value at the step. Default: ``False``.
-        ignore_index (int, optional): The class index to ignore. Default: ``-100``.
+        ignore_index (int, optional): The class index to ignore. Set to ``None`` to not ignore any class index, which
+            avoids masking the target on every update. Default: ``-100``.
     """
 
-    def __init__(self, vocab_size: int, dist_sync_on_step=False, ignore_index: int = -100):
+    def __init__(self, vocab_size: int, dist_sync_on_step=False, ignore_index: Optional[int] = -100):
         super().__init__(dist_sync_on_step=dist_sync_on_step)
 
         self.vocab_size = vocab_size
         self.ignore_index = ignore_index
-        self.loss_fn = torch.nn.CrossEntropyLoss(ignore_index=ignore_index, reduction="sum")
+        # ignore_index may legitimately be 0, so compare against None rather than testing truthiness
+        self._has_ignore_index = ignore_index is not None
+        # F.cross_entropy requires an int, and -100 is its default
+        self._loss_ignore_index = ignore_index if ignore_index is not None else -100
         self.add_state("sum_loss", default=torch.tensor(0.), dist_reduce_fx="sum")
         self.add_state("total_items", default=torch.tensor(0), dist_reduce_fx="sum")
 
@@ -85,11 +120,18 @@ class CrossEntropyLoss(Metric):
         """
 
         assert isinstance(output, Tensor)
+        self._to_input_device(output)
         output = output.view(-1, self.vocab_size)
         target = target.view(-1)
-        losses = self.loss_fn(output, target)
+        # Sum the per-token losses in the precision of the metric state. With FP16 outputs, a FP16 sum over every
+        # token in the batch can overflow, even though each individual loss is representable.
+        losses = F.cross_entropy(output, target, ignore_index=self._loss_ignore_index, reduction="none")
+        losses = losses.sum(dtype=self.sum_loss.dtype)  #type: ignore (third-party)
 
-        total_items = (target != self.ignore_index).sum()
+        if self._has_ignore_index:
+            total_items = (target != self.ignore_index).sum()
+        else:
+            total_items = target.numel()
         self.total_items += total_items  #type: ignore (third-party)
 
         # accmulate loss over all batches
@@ -105,13 +147,13 @@ class CrossEntropyLoss(Metric):
         return self.sum_loss / self.total_items  #type: ignore (third-party)
 
 
-class BinaryF1Score(Metric):
-    """Implements F1 Scores for binary classification tasks via sklearn.
+class BinaryF1Score(_SummedStatesMetric):
+    """Implements F1 Scores for binary classification tasks.
 
     Adds metric state variables:
-        true_positive (float): A counter of how many items were correctly classified as positives.
-        false_positive (float): A counter of how many items were incorrectly classified as positives.
-        false_negative (float): A counter of how many items were incorrectly classified as negatives.
+        true_positive (int): A counter of how many items were correctly classified as positives.
+        false_positive (int): A counter of how many items were incorrectly classified as positives.
+        false_negative (int): A counter of how many items were incorrectly classified as negatives.
 
     Args:
         dist_sync_on_step (bool, optional): Synchronize metric state across processes at
@@ -121,7 +163,7 @@ class BinaryF1Score(Metric):
     def __init__(self, dist_sync_on_step=False):
         super().__init__(dist_sync_on_step=dist_sync_on_step)
 
-        self.add_state("true_positive", default=torch.tensor(0.), dist_reduce_fx="sum")
+        self.add_state("true_positive", default=torch.tensor(0), dist_reduce_fx="sum")
         self.add_state("false_positive", default=torch.tensor(0), dist_reduce_fx="sum")
         self.add_state("false_negative", default=torch.tensor(0), dist_reduce_fx="sum")
 
@@ -133,26 +175,32 @@ class BinaryF1Score(Metric):
                 either the Tensor or a Mapping type that contains the loss or model logits.
             target (~torch.Tensor): A Tensor of ground-truth values to compare against.
         """
+        self._to_input_device(output)
         predictions = torch.argmax(output, dim=1)
-        self.true_positive += predictions[(target == 1)].sum()
-        self.false_positive += (predictions[(target == 1)] == 0).sum()
-        self.false_negative += (predictions[(target == 0)] == 1).sum()
+        # masked reductions, rather than boolean indexing, to avoid materializing the selected elements
+        predicted_positive = predictions == 1
+        actual_positive = target == 1
+        self.true_positive += (predicted_positive & actual_positive).sum()
+        self.false_positive += (predicted_positive & ~actual_positive).sum()
+        self.false_negative += (~predicted_positive & actual_positive).sum()
 
     def compute(self) -> Tensor:
         """Aggregate the state over all processes to compute the metric.
 
         Returns:
-            loss: The loss averaged across all batches as a :class:`~torch.Tensor`.
+            f1: The F1 score across all batches as a :class:`~torch.Tensor`.
         """
         assert isinstance(self.true_positive, Tensor)
         assert isinstance(self.false_positive, Tensor)
         assert isinstance(self.false_negative, Tensor)
 
-        f1 = (self.true_positive) / (self.true_positive + (0.5 * (self.false_negative + self.false_positive)))
+        # Equivalent to tp / (tp + 0.5 * (fp + fn)). Returns 0 if there are no positives at all, matching sklearn.
+        denominator = (2 * self.true_positive + self.false_positive + self.false_negative).clamp(min=1)
+        f1 = (2 * self.true_positive).float() / denominator
         return f1
 
 
-class LanguageCrossEntropyLoss(Metric):
+class LanguageCrossEntropyLoss(_SummedStatesMetric):
     """Hugging Face compatible cross entropy loss.
 
     Adds metric state variables:
@@ -193,6 +241,8 @@ class LanguageCrossEntropyLoss(Metric):
 
             loss = soft_cross_entropy(logits, target)
 
+        # the target may be None when the loss is provided by the model, so take the device from the loss
+        self._to_input_device(loss)
         # accmulate loss over all batches
         self.sum_loss += loss
 
@@ -216,6 +266,9 @@ class Perplexity(LanguageCrossEntropyLoss):
     """
 
     def compute(self) -> Tensor:
-        """Returns torch.exp() of the LanguageCrossEntropyLoss."""
+        """Returns torch.exp() of the LanguageCrossEntropyLoss.
+
+        The result remains on the device of the metric state; it is converted to a Python value by the loggers.
+        """
         avg_loss = super().compute()
         return torch.exp(avg_loss)
@@ -2,16 +2,58 @@
 
 """Implements ViT-S/16 as a :class:`.ComposerClassifier`."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import torch
+import torch.nn.functional as F
+
 from composer.models.base import ComposerClassifier
+from composer.utils import module_surgery
+
+if TYPE_CHECKING:
+    from vit_pytorch.vit import Attention
 
 __all__ = ["ViTSmallPatch16"]
 
 
+class _FusedAttention(torch.nn.Module):
+    """Replacement for the ``vit_pytorch`` attention block that uses a fused attention kernel.
+
+    The ``vit_pytorch`` implementation materializes the ``(n x n)`` attention matrix.
+    :func:`torch.nn.functional.scaled_dot_product_attention` computes the same result without materializing it,
+    dispatching to FlashAttention or memory-efficient attention where supported. The projection layers are taken from
+    the original block, so the parameters and ``state_dict`` keys are unchanged.
+
+    Args:
+        attention (Attention): The ``vit_pytorch`` attention block to replace.
+    """
+
+    def __init__(self, attention: Attention) -> None:
+        super().__init__()
+        self.heads: int = attention.heads
+        self.to_qkv: torch.nn.Module = attention.to_qkv
+        self.to_out: torch.nn.Module = attention.to_out
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        batch_size, num_tokens, _ = x.shape
+        q, k, v = (
+            t.view(batch_size, num_tokens, self.heads, -1).transpose(1, 2) for t in self.to_qkv(x).chunk(3, dim=-1))
+        # the default scale, 1 / sqrt(head_dim), matches ``attention.scale``
+        out = F.scaled_dot_product_attention(q, k, v)  # type: ignore (requires torch>=2.0)
+        out = out.transpose(1, 2).reshape(batch_size, num_tokens, -1)
+        return self.to_out(out)
+
+
 class ViTSmallPatch16(ComposerClassifier):
     """Implements ViT-S/16 as a :class:`.ComposerClassifier`.
 
     See `Training data-efficient image transformers & distillation through attention <https://arxiv.org/pdf/2012.12877.pdf>`_ (Touvron et al, 2021) for details on ViT-S/16.
 
+    If available (PyTorch 2.0+), the attention blocks use :func:`torch.nn.functional.scaled_dot_product_attention`,
+    which avoids materializing the attention matrix.
+
     Args:
         num_classes (int, optional): number of classes for the model. Default: ``1000``.
         image_size (int, optional): input image size. If you have rectangular images, make sure your image
@@ -28,6 +70,7 @@ class ViTSmallPatch16(ComposerClassifier):
                  dropout: float = 0.0,
                  embedding_dropout: float = 0.0) -> None:
         from vit_pytorch import ViT
+        from vit_pytorch.vit import Attention
         model = ViT(
             image_size=image_size,
             channels=channels,
@@ -39,4 +82,6 @@ class ViTSmallPatch16(ComposerClassifier):
             mlp_dim=1536,
             dropout=dropout,
             emb_dropout=embedding_dropout)
+        if hasattr(F, "scaled_dot_product_attention"):
+            module_surgery.replace_module_classes(model, {Attention: lambda module, idx: _FusedAttention(module)})
         super().__init__(module=model)
@@ -25,14 +25,21 @@ def main() -> None:
     if len(sys.argv) == 1:
         sys.argv = [sys.argv[0], "--help"]
 
-    parser = argparse.ArgumentParser(parents=[TrainerHparams.get_argparse(cli_args=True)])
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
     parser.add_argument("--detailed",
                         default=False,
                         action="store_true",
                         help="Whether to record all system level statistics and torch tensor shapes and stack traces.")
 
-    args, _ = parser.parse_known_args()
-    hparams = TrainerHparams.create(cli_args=True)  # reads cli args from sys.argv
+    if "-h" in sys.argv or "--help" in sys.argv:
+        # Building the full argparser requires parsing the hparams, so only do it to include --detailed in the help
+        # This prints the help and exits
+        argparse.ArgumentParser(parents=[TrainerHparams.get_argparse(cli_args=True), parser]).parse_known_args()
+
+    # Parse --detailed separately, and pass the remaining cli args to the TrainerHparams, so the hparams are only
+    # parsed once
+    args, remaining_cli_args = parser.parse_known_args()
+    hparams = TrainerHparams.create(cli_args=remaining_cli_args)
     logging.getLogger(composer.__name__).setLevel(hparams.log_level)
 
     # Configure the Composer profiler
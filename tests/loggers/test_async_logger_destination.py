@@ -0,0 +1,83 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import threading
+from typing import List, Tuple
+
+import pytest
+
+from composer.core import State, Timestamp
+from composer.loggers import AsyncLoggerDestination, Logger, LogLevel
+from composer.loggers.logger import LoggerDataDict
+
+
+class _RecordingLogger(AsyncLoggerDestination):
+
+    def __init__(self, max_queue_size: int = 1000) -> None:
+        super().__init__(max_queue_size=max_queue_size)
+        self.records: List[Tuple[Timestamp, LogLevel, LoggerDataDict]] = []
+        self.thread_ids = set()
+
+    def _log_data_sync(self, timestamp: Timestamp, log_level: LogLevel, data: LoggerDataDict) -> None:
+        self.thread_ids.add(threading.get_ident())
+        self.records.append((timestamp, log_level, data))
+
+
+def test_async_logger_destination(dummy_state: State):
+    async_logger = _RecordingLogger()
+    logger = Logger(dummy_state, destinations=[async_logger])
+    async_logger.init(dummy_state, logger)
+
+    data = {"metric": [1]}
+    logger.data_batch(data)
+    # the logged data should be copied, so mutating it afterwards has no effect
+    data["metric"].append(2)
+    dummy_state.timer.on_batch_complete(samples=1, tokens=1)
+    logger.data_epoch({"metric": [3]})
+
+    async_logger.close()
+
+    assert len(async_logger.records) == 2
+    timestamp, log_level, logged_data = async_logger.records[0]
+    assert timestamp.batch == 0
+    assert log_level == LogLevel.BATCH
+    assert logged_data == {"metric": [1]}
+    timestamp, log_level, logged_data = async_logger.records[1]
+    assert timestamp.batch == 1
+    assert log_level == LogLevel.EPOCH
+    assert logged_data == {"metric": [3]}
+
+    # all writes should happen off of the training loop thread
+    assert threading.get_ident() not in async_logger.thread_ids
+
+
+def test_async_logger_destination_drops_oldest(dummy_state: State):
+    async_logger = _RecordingLogger(max_queue_size=2)
+    logger = Logger(dummy_state, destinations=[async_logger])
+
+    # before INIT, nothing is drained, so the queue will fill up
+    for i in range(5):
+        logger.data_batch({"metric": i})
+
+    async_logger.init(dummy_state, logger)
+    async_logger.close()
+
+    assert [data["metric"] for _, _, data in async_logger.records] == [3, 4]
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_async_logger_destination_thread_crash(dummy_state: State):
+
+    class _CrashingLogger(AsyncLoggerDestination):
+
+        def _log_data_sync(self, timestamp: Timestamp, log_level: LogLevel, data: LoggerDataDict) -> None:
+            raise ValueError("crash")
+
+    async_logger = _CrashingLogger()
+    logger = Logger(dummy_state, destinations=[async_logger])
+    async_logger.init(dummy_state, logger)
+    logger.data_batch({"metric": 0})
+    assert async_logger._thread is not None
+    async_logger._thread.join(timeout=5)
+
+    with pytest.raises(RuntimeError):
+        async_logger.batch_end(dummy_state, logger)
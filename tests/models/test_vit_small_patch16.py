@@ -0,0 +1,65 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import math
+
+import pytest
+import torch
+import torch.nn.functional as F
+
+from composer.models.vit_small_patch16.model import ViTSmallPatch16, _FusedAttention
+
+
+def _reference_scaled_dot_product_attention(query: torch.Tensor, key: torch.Tensor,
+                                            value: torch.Tensor) -> torch.Tensor:
+    attention = torch.softmax(query @ key.transpose(-2, -1) / math.sqrt(query.shape[-1]), dim=-1)
+    return attention @ value
+
+
+@pytest.fixture
+def scaled_dot_product_attention(monkeypatch: pytest.MonkeyPatch):
+    # torch<2.0 does not provide scaled_dot_product_attention, so patch in an eager implementation to test the
+    # fused attention block independently of the installed torch version
+    monkeypatch.setattr(F, "scaled_dot_product_attention", _reference_scaled_dot_product_attention, raising=False)
+
+
+@pytest.mark.usefixtures("scaled_dot_product_attention")
+def test_fused_attention_matches_reference():
+    pytest.importorskip("vit_pytorch")
+    from vit_pytorch.vit import Attention
+
+    torch.manual_seed(42)
+    reference_attention = Attention(dim=384, heads=6, dim_head=64).eval()
+    fused_attention = _FusedAttention(reference_attention).eval()
+
+    # the fused block reuses the original projections, so the parameters are unchanged
+    assert fused_attention.state_dict().keys() == reference_attention.state_dict().keys()
+
+    x = torch.randn(2, 197, 384)
+    with torch.no_grad():
+        torch.testing.assert_close(fused_attention(x), reference_attention(x))
+
+
+@pytest.mark.usefixtures("scaled_dot_product_attention")
+def test_vit_small_patch16_uses_fused_attention():
+    pytest.importorskip("vit_pytorch")
+    from vit_pytorch import ViT
+    from vit_pytorch.vit import Attention
+
+    torch.manual_seed(42)
+    model = ViTSmallPatch16(num_classes=10, image_size=32).eval()
+    assert not any(isinstance(module, Attention) for module in model.modules())
+    assert sum(isinstance(module, _FusedAttention) for module in model.modules()) == 12
+
+    reference_model = ViT(image_size=32,
+                          channels=3,
+                          num_classes=10,
+                          dim=384,
+                          patch_size=16,
+                          depth=12,
+                          heads=6,
+                          mlp_dim=1536).eval()
+    reference_model.load_state_dict(model.module.state_dict())
+
+    x = torch.randn(2, 3, 32, 32)
+    with torch.no_grad():
+        torch.testing.assert_close(model.module(x), reference_model(x))
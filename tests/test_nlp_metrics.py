@@ -1,12 +1,16 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
+import copy
+import datetime
 import math
 
 import pytest
 import torch
 from torch.nn.functional import cross_entropy
 
-from composer.models.nlp_metrics import BinaryF1Score, CrossEntropyLoss, MaskedAccuracy
+from composer.models.nlp_metrics import (BinaryF1Score, CrossEntropyLoss, LanguageCrossEntropyLoss, MaskedAccuracy,
+                                         Perplexity)
+from composer.utils import dist
 
 
 @pytest.mark.parametrize("ignore_index", [-100])
@@ -43,7 +47,7 @@ def test_masked_accuracy(ignore_index, num_classes):
     assert abs(final_acc - (1.0 / num_classes)) < 0.02
 
 
-@pytest.mark.parametrize("ignore_index", [-100])
+@pytest.mark.parametrize("ignore_index", [-100, 0, None])
 @pytest.mark.parametrize("batch_size", [1e2, 1e3])
 @pytest.mark.parametrize("sequence_length", [128])
 @pytest.mark.parametrize("num_classes", [2, 10])
@@ -85,10 +89,59 @@ def test_cross_entropy(batch_size: float, ignore_index: int, sequence_length: in
         torchmetrics_xent.update(preds_subset, true_subset)
 
     torchmetrics_loss = torchmetrics_xent.compute()
-    correct_loss = cross_entropy(generated_preds.view(-1, num_classes), generated_true.view(-1))
+    if ignore_index is None:
+        correct_loss = cross_entropy(generated_preds.view(-1, num_classes), generated_true.view(-1))
+    else:
+        correct_loss = cross_entropy(generated_preds.view(-1, num_classes),
+                                     generated_true.view(-1),
+                                     ignore_index=ignore_index)
     assert torch.isclose(correct_loss, torchmetrics_loss)
 
 
+@pytest.mark.gpu
+def test_cross_entropy_fp16_no_overflow():
+    """Checks that CrossEntropyLoss does not overflow when summing the loss over many tokens with FP16 outputs."""
+    num_classes = 10
+    # the summed loss over this many tokens is well above the FP16 maximum of 65504
+    generated_preds = torch.randn((64, 1024, num_classes), device="cuda")
+    generated_true = torch.randint(low=0, high=num_classes, size=(64, 1024), device="cuda")
+
+    torchmetrics_xent = CrossEntropyLoss(vocab_size=num_classes).to("cuda")
+    torchmetrics_xent.update(generated_preds.half(), generated_true)
+    torchmetrics_loss = torchmetrics_xent.compute()
+
+    correct_loss = cross_entropy(generated_preds.view(-1, num_classes), generated_true.view(-1))
+    assert torch.isfinite(torchmetrics_loss)
+    assert torch.isclose(correct_loss, torchmetrics_loss, rtol=1e-2)
+
+
+@pytest.mark.gpu
+@pytest.mark.parametrize("metric_cls", [CrossEntropyLoss, LanguageCrossEntropyLoss])
+def test_metric_moves_to_input_device(metric_cls):
+    """Checks that a metric left on the CPU moves its states to the device of the inputs on the first update."""
+    num_classes = 10
+    generated_preds = torch.randn((8, num_classes), device="cuda")
+    generated_true = torch.randint(low=0, high=num_classes, size=(8,), device="cuda")
+
+    if metric_cls is CrossEntropyLoss:
+        metric = CrossEntropyLoss(vocab_size=num_classes)
+    else:
+        metric = LanguageCrossEntropyLoss()
+    assert metric.device.type == "cpu"
+    metric.update(generated_preds, generated_true)
+
+    for attr, default in metric._defaults.items():
+        assert getattr(metric, attr).device.type == "cuda"
+        assert default.device.type == "cuda"
+    computed_loss = metric.compute()
+    assert computed_loss.device.type == "cuda"
+    assert torch.isclose(computed_loss, cross_entropy(generated_preds, generated_true))
+
+    metric.reset()
+    for attr in metric._defaults:
+        assert getattr(metric, attr).device.type == "cuda"
+
+
 @pytest.mark.parametrize("batch_size", [1e2, 1e3, 1e4])
 @pytest.mark.parametrize("minibatch_size", [256, 768])
 def test_binary_f1(batch_size, minibatch_size):
@@ -122,3 +175,87 @@ def test_binary_f1(batch_size, minibatch_size):
     generated_preds = torch.argmax(generated_preds, dim=1)
     correct_f1 = f1_score(y_true=generated_true, y_pred=generated_preds)
     assert correct_f1 == torchmetrics_f1
+
+
+def test_binary_f1_no_positives():
+    """If there are no positive predictions or targets, the F1 score should be 0 (rather than NaN), like sklearn."""
+    binary_f1 = BinaryF1Score()
+    generated_preds = torch.tensor([[1.0, 0.0], [1.0, 0.0]])
+    generated_true = torch.tensor([0, 0])
+    binary_f1.update(generated_preds, generated_true)
+    assert binary_f1.compute() == 0
+
+
+def test_perplexity():
+    """Checks that Perplexity is the exponential of the LanguageCrossEntropyLoss."""
+    num_classes = 10
+    loss_metric = LanguageCrossEntropyLoss()
+    perplexity = Perplexity()
+    for _ in range(3):
+        generated_preds = torch.randn((8, num_classes))
+        generated_true = torch.randint(low=0, high=num_classes, size=(8,))
+        loss_metric.update(generated_preds, generated_true)
+        perplexity.update(generated_preds, generated_true)
+
+    assert torch.isclose(perplexity.compute(), torch.exp(loss_metric.compute()))
+
+
+def test_perplexity_copied():
+    """Checks that a Perplexity copied on its own (e.g. by ``EvaluatorHparams``) still computes the perplexity."""
+    num_classes = 10
+    perplexity = copy.deepcopy(Perplexity())
+    reference_loss = LanguageCrossEntropyLoss()
+    for _ in range(3):
+        generated_preds = torch.randn((8, num_classes))
+        generated_true = torch.randint(low=0, high=num_classes, size=(8,))
+        perplexity.update(generated_preds, generated_true)
+        reference_loss.update(generated_preds, generated_true)
+
+    computed_perplexity = perplexity.compute()
+    assert torch.isfinite(computed_perplexity)
+    assert torch.isclose(computed_perplexity, torch.exp(reference_loss.compute()))
+
+
+def test_language_cross_entropy_loss_from_output():
+    """Checks that LanguageCrossEntropyLoss uses the loss from the model output, without requiring a target.
+
+    This is the path taken by transformer models, whose ``validate`` returns a ``None`` target.
+    """
+    loss_metric = LanguageCrossEntropyLoss()
+    loss_metric.update({"loss": torch.tensor(2.)}, None)
+    loss_metric.update({"loss": torch.tensor(4.)}, None)
+    assert loss_metric.compute() == 3.
+
+
+@pytest.mark.world_size(2)
+def test_cross_entropy_dist_sync():
+    """Checks that the packed all-reduce sync of CrossEntropyLoss matches the loss computed over the data from all
+    ranks."""
+    # need to manually initialize distributed if not already initialized, since this test occurs outside of the trainer
+    if not dist.is_initialized():
+        dist.initialize_dist('gloo', timeout=datetime.timedelta(seconds=5))
+
+    num_classes = 10
+    sequence_length = 16
+    generator = torch.Generator().manual_seed(42)
+    # every rank generates the same data, then updates the metric with its own shard of it
+    generated_preds = torch.randn((dist.get_world_size() * 4, sequence_length, num_classes), generator=generator)
+    generated_true = torch.randint(low=0,
+                                   high=num_classes,
+                                   size=(dist.get_world_size() * 4, sequence_length),
+                                   generator=generator)
+    rank = dist.get_global_rank()
+
+    torchmetrics_xent = CrossEntropyLoss(vocab_size=num_classes)
+    torchmetrics_xent.update(generated_preds[rank * 4:(rank + 1) * 4], generated_true[rank * 4:(rank + 1) * 4])
+    torchmetrics_loss = torchmetrics_xent.compute()
+
+    correct_loss = cross_entropy(generated_preds.view(-1, num_classes), generated_true.view(-1))
+    assert torch.isclose(correct_loss, torchmetrics_loss)
+
+    # the local state should not be modified by the sync
+    local_loss = cross_entropy(generated_preds[rank * 4:(rank + 1) * 4].view(-1, num_classes),
+                               generated_true[rank * 4:(rank + 1) * 4].view(-1),
+                               reduction="sum")
+    assert torch.isclose(torchmetrics_xent.sum_loss, local_loss)
+    assert torchmetrics_xent.total_items.dtype == torch.int64